@@ -4,7 +4,7 @@ from pathlib import Path
 from detector.parser import parse_requirements
 from detector.health_checker import HealthChecker ,HealthStatus
 from detector.report import Reporter
-from detector.config import GITHUB_TOKEN, ZOMBIE_THRESHOLD_DAYS
+from detector.config import GITHUB_TOKENS, ZOMBIE_THRESHOLD_DAYS, MAX_WORKERS
 
 
 def main():
@@ -37,10 +37,16 @@ def main():
         action='store_true',
         help='Validation mode: only check if packages exist on PyPI (skip GitHub checks)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=MAX_WORKERS,
+        help=f'Number of packages to check concurrently (default: {MAX_WORKERS})'
+    )
     parser.add_argument(
         '--no-cache',
         action='store_true',
-        help='Disable caching of GitHub API responses'
+        help='Ignore the on-disk cache of PyPI and GitHub API responses (query everything fresh)'
     )
     parser.add_argument(
         '--version',
@@ -53,7 +59,7 @@ def main():
     reporter = Reporter(output_format=args.format)
     
     
-    if not args.validate and not GITHUB_TOKEN and args.format == 'table':
+    if not args.validate and not GITHUB_TOKENS and args.format == 'table':
         reporter.print_warning(
             "GITHUB_TOKEN not found in environment. "
             "API rate limits will be more restrictive (60 requests/hour)."
@@ -87,8 +93,9 @@ def main():
         return 1
     
     # Initialize health checker with custom threshold
-    checker = HealthChecker(threshold_days=args.days)
-    results = []
+    checker = HealthChecker(
+        threshold_days=args.days, max_workers=args.workers, no_cache=args.no_cache
+    )
     
     # Scan packages with progress bar (only for table format)
     if args.format == 'table':
@@ -98,29 +105,18 @@ def main():
                 total=len(packages)
             )
             
-            for package in packages:
-                progress.update(task, description=f"[cyan]Checking {package}...")
-                
-                if args.validate:
-                    health = checker.validate_package(package)
-                else:
-                    health = checker.check_package(package)
-                
-                results.append(health)
-                progress.advance(task)
+            results = checker.check_packages(
+                packages,
+                validate=args.validate,
+                on_complete=lambda health: progress.advance(task)
+            )
     else:
         # Silent scanning for JSON/Markdown output
-        for package in packages:
-            if args.validate:
-                health = checker.validate_package(package)
-            else:
-                health = checker.check_package(package)
-            results.append(health)
+        results = checker.check_packages(packages, validate=args.validate)
     
-    reporter.print_summary(results)
-    reporter.print_results(results)
-    has_warning = any(r.status == HealthStatus.WARNING for r in results)
-    has_invalid = any(r.status == HealthStatus.INVALID for r in results)
+    reporter.report(results)
+    has_warning = any(r.status is HealthStatus.WARNING for r in results)
+    has_invalid = any(r.status is HealthStatus.INVALID for r in results)
     
     return 1 if (has_warning or has_invalid) else 0
 
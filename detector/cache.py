@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+
+class CacheStore:
+    """
+    Persistent key/value cache backed by a SQLite table.
+
+    Each entry is one row, so storing a result writes only that row instead of
+    rewriting the whole cache. A single connection is shared between worker
+    threads and guarded by a lock. With no `path` the table lives in memory
+    and is discarded when the process exits.
+    """
+
+    def __init__(self, path: Optional[Path], table: str, fields: Sequence[str]):
+        self.table = table
+        self.fields = tuple(fields)
+        self._lock = threading.Lock()
+
+        try:
+            self._conn = self._connect(str(path) if path else ':memory:')
+        except sqlite3.Error as e:
+            print(f"Warning: Could not open cache {path}: {e}")
+            self._conn = self._connect(':memory:')
+
+        columns = ", ".join(self.fields)
+        self._select_sql = f"SELECT {columns}, cached_at FROM {table} WHERE key = ?"
+        self._upsert_sql = (
+            f"INSERT OR REPLACE INTO {table} (key, {columns}, cached_at) "
+            f"VALUES (?, {', '.join('?' for _ in self.fields)}, ?)"
+        )
+
+    def _connect(self, database: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        
+        # Entries are disposable, so a table written with a different layout is
+        # dropped rather than migrated.
+        existing = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")]
+        if existing and existing != ['key', *self.fields, 'cached_at']:
+            conn.execute(f"DROP TABLE {self.table}")
+        
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            f"(key TEXT PRIMARY KEY, {', '.join(self.fields)}, cached_at REAL)"
+        )
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry stored under `key`, regardless of age."""
+        try:
+            with self._lock:
+                row = self._conn.execute(self._select_sql, (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read cache: {e}")
+            return None
+
+        if row is None:
+            return None
+        return dict(zip(self.fields + ('cached_at',), row))
+
+    def get_fresh(self, key: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """Return the entry stored under `key` if it is younger than `max_age` seconds."""
+        entry = self.get(key)
+        if entry and entry['cached_at'] and time.time() - entry['cached_at'] < max_age:
+            return entry
+        return None
+
+    def put(self, key: str, **values: Any):
+        """Store a single entry, stamping it with the current time."""
+        self.put_many([(key, values)])
+
+    def put_many(self, entries: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Store several entries in one transaction."""
+        now = time.time()
+        rows = [
+            (key, *(values.get(field) for field in self.fields), now)
+            for key, values in entries
+        ]
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(self._upsert_sql, rows)
+                    self._conn.execute("COMMIT")
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            print(f"Warning: Could not save cache: {e}")
@@ -1,17 +1,33 @@
 import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
+# Optional comma-separated pool of tokens; requests rotate between them
+GITHUB_TOKENS: List[str] = [
+    t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()
+] or ([GITHUB_TOKEN] if GITHUB_TOKEN else [])
 
 
 ZOMBIE_THRESHOLD_DAYS = 730  
+MAX_WORKERS = 20
+PARALLEL_PARSE_MIN_LINES = 10000  # requirements files this long are parsed across forked processes
+HTTP_RETRIES = 3
+USER_AGENT = "Zombie-Package-Detector/1.0"
 CACHE_DIR = Path.home() / ".cache" / "zombie-detector"
-CACHE_FILE = CACHE_DIR / "github_cache.json"
+CACHE_FILE = CACHE_DIR / "cache.sqlite"
+CACHE_TTL_SECONDS = 24 * 60 * 60
 PYPI_API_URL = "https://pypi.org/pypi/{package}/json"
 GITHUB_API_URL = "https://api.github.com/repos/{owner}/{repo}"
-GITHUB_PATTERNS = ["github.com"]
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 100
+GITHUB_REQUESTS_PER_SECOND = 10  # per token, keeps bursts under secondary rate limits
+RATE_LIMIT_MAX_WAIT = 60  # seconds to wait for a primary rate limit reset
+GITHUB_HOSTS = frozenset({"github.com", "www.github.com"})
 PRIORITY_LABELS = ["source", "code", "repository", "repo"]
 IGNORE_LABELS = ["documentation", "docs", "tracker", "issues", "bug"]
+PRIORITY_RE = re.compile("|".join(map(re.escape, PRIORITY_LABELS)))
+IGNORE_RE = re.compile("|".join(map(re.escape, IGNORE_LABELS)))
 
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
@@ -1,55 +1,102 @@
 import json
-import hashlib
+import itertools
+import threading
+import time
 import requests
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Callable, Optional, Dict, Any, List
 from pathlib import Path
 from urllib.parse import urlparse
-from detector.config import GITHUB_TOKEN, GITHUB_API_URL, CACHE_FILE
+from detector.cache import CacheStore
+from detector.config import (
+    GITHUB_TOKENS, GITHUB_API_URL, GITHUB_GRAPHQL_URL, GRAPHQL_BATCH_SIZE,
+    GITHUB_REQUESTS_PER_SECOND, RATE_LIMIT_MAX_WAIT, CACHE_FILE, CACHE_TTL_SECONDS
+)
+from detector.jsonlib import json_loads
+from detector.ratelimit import TokenBucket
+from detector.session import create_session
 
 
 class GitHubClient:
     """Client for interacting with GitHub API with caching."""
     
-    def __init__(self, token: Optional[str] = None, cache_file: Path = CACHE_FILE):
-        self.token = token or GITHUB_TOKEN
+    def __init__(self, token: Optional[str] = None, cache_file: Optional[Path] = CACHE_FILE,
+                 session: Optional[requests.Session] = None,
+                 tokens: Optional[List[str]] = None):
+        self.tokens = tokens or ([token] if token else GITHUB_TOKENS)
+        self.token = self.tokens[0] if self.tokens else None
         self.cache_file = cache_file
-        self.session = requests.Session()
+        self.session = session or create_session()
         
         # Set up headers
-        self.session.headers.update({
-            'User-Agent': 'Zombie-Package-Detector/1.0',
-            'Accept': 'application/vnd.github.v3+json'
-        })
+        self.session.headers['Accept'] = 'application/vnd.github.v3+json'
         
-        if self.token:
-            self.session.headers['Authorization'] = f'token {self.token}'
+        # Requests are paced per token and rotate round-robin between tokens;
+        # tokens that hit their primary rate limit are skipped until reset.
+        self._limiter = TokenBucket(GITHUB_REQUESTS_PER_SECOND * max(1, len(self.tokens)))
+        self._token_cycle = itertools.cycle(self.tokens)
+        self._token_resets: Dict[str, float] = {}
+        self._token_lock = threading.Lock()
         
-        # Load cache
-        self.cache = self._load_cache()
+        self.cache = CacheStore(
+            cache_file, 'repo', ('url', 'pushed_at_epoch', 'etag', 'last_modified')
+        )
     
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load cache from disk"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load cache: {e}")
-                return {}
-        return {}
-    
-    def _save_cache(self):
-        """Save cache to disk"""
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2)
-        except IOError as e:
-            print(f"Warning: Could not save cache: {e}")
+    def _next_token(self) -> Optional[str]:
+        """Pick the next token that is not rate limited (or the one resetting soonest)."""
+        if not self.tokens:
+            return None
+        
+        with self._token_lock:
+            now = time.time()
+            for _ in range(len(self.tokens)):
+                token = next(self._token_cycle)
+                if self._token_resets.get(token, 0) <= now:
+                    return token
+            return min(self.tokens, key=lambda t: self._token_resets[t])
     
-    def _get_cache_key(self, github_url: str) -> str:
-        """Generate cache key from GitHub URL."""
-        return hashlib.sha256(github_url.encode()).hexdigest()
+    def _request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                 **kwargs) -> requests.Response:
+        """
+        Send a paced, authenticated request.
+        
+        When a token is out of quota the request is retried with the next
+        available token; if every token is exhausted and the earliest reset is
+        within RATE_LIMIT_MAX_WAIT seconds, it waits once for the reset.
+        """
+        waited = False
+        for _ in range(len(self.tokens) + 2):
+            self._limiter.acquire()
+            token = self._next_token()
+            request_headers = dict(headers or {})
+            if token:
+                request_headers['Authorization'] = f'Bearer {token}'
+            
+            response = self.session.request(
+                method, url, headers=request_headers, timeout=10, **kwargs
+            )
+            
+            if (response.status_code not in (403, 429)
+                    or response.headers.get('X-RateLimit-Remaining') != '0'):
+                return response
+            
+            reset_at = float(response.headers.get('X-RateLimit-Reset', 0))
+            if token:
+                with self._token_lock:
+                    self._token_resets[token] = reset_at
+                    now = time.time()
+                    available = any(self._token_resets.get(t, 0) <= now for t in self.tokens)
+                if available:
+                    continue
+            
+            wait = reset_at - time.time()
+            if waited or wait > RATE_LIMIT_MAX_WAIT:
+                return response
+            waited = True
+            time.sleep(max(0, wait))
+        
+        return response
     
     def _parse_github_url(self, github_url: str) -> Optional[tuple]:
         
@@ -67,23 +114,7 @@ class GitHubClient:
             return None
     
     def get_repo_info(self, github_url: str) -> Optional[Dict[str, Any]]:
-        """Fetch repository information from GitHub API"""
-        cache_key = self._get_cache_key(github_url)
-        
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            cached_at_str = cached_data.get('cached_at')
-            if cached_at_str:
-                try:
-                    cached_at = datetime.fromisoformat(cached_at_str)
-                    if datetime.utcnow() - cached_at < timedelta(hours=24):
-                            return {
-                                'pushed_at': cached_data.get('pushed_at'),
-                                'from_cache': True
-                            }
-                except ValueError:
-                    pass
-        
+        """Fetch repository information from GitHub API (`pushed_at` as a datetime)"""
         # Parse GitHub URL
         parsed = self._parse_github_url(github_url)
         if not parsed:
@@ -91,10 +122,34 @@ class GitHubClient:
             return None
         
         owner, repo = parsed
+        cache_key = f"{owner}/{repo}".lower()
+        
+        cached_data = self.cache.get_fresh(cache_key, CACHE_TTL_SECONDS)
+        if cached_data:
+            return {
+                'pushed_at': self._from_epoch(cached_data['pushed_at_epoch']),
+                'from_cache': True
+            }
+        
+        # Revalidate a stale entry instead of refetching it: GitHub does not
+        # count 304 Not Modified responses against the rate limit.
+        stale_data = self.cache.get(cache_key) or {}
+        headers = {}
+        if stale_data.get('etag'):
+            headers['If-None-Match'] = stale_data['etag']
+        elif stale_data.get('last_modified'):
+            headers['If-Modified-Since'] = stale_data['last_modified']
         
         try:
             url = GITHUB_API_URL.format(owner=owner, repo=repo)
-            response = self.session.get(url, timeout=10)
+            response = self._request('GET', url, headers=headers)
+            
+            if response.status_code == 304:
+                self.cache.put(cache_key, **stale_data)
+                return {
+                    'pushed_at': self._from_epoch(stale_data.get('pushed_at_epoch')),
+                    'from_cache': True
+                }
             
             # Handle rate limiting
             if response.status_code == 403:
@@ -108,19 +163,21 @@ class GitHubClient:
                 return None
             
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
+            pushed_at_epoch = self._to_epoch(data.get('pushed_at'), github_url)
             repo_info = {
-                'pushed_at': data.get('pushed_at'),
+                'pushed_at': self._from_epoch(pushed_at_epoch),
                 'from_cache': False
             }
             
             # Cache the result
-            self.cache[cache_key] = {
-                'pushed_at': repo_info['pushed_at'],
-                'cached_at': datetime.utcnow().isoformat(),
-                'url': github_url
-            }
-            self._save_cache()
+            self.cache.put(
+                cache_key,
+                url=github_url,
+                pushed_at_epoch=pushed_at_epoch,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
             
             return repo_info
             
@@ -136,11 +193,133 @@ class GitHubClient:
         """Get the date of the last commit (pushed_at)"""
         
         repo_info = self.get_repo_info(github_url)
-        if not repo_info or not repo_info.get('pushed_at'):
+        if not repo_info:
+            return None
+        return repo_info['pushed_at']
+    
+    def get_repos_bulk(self, urls: List[str], max_workers: int = 1,
+                       on_result: Optional[Callable[[str, Optional[datetime]], None]] = None
+                       ) -> Dict[str, Optional[datetime]]:
+        """Get the last commit date for many repositories, calling `on_result(url, date)` as each resolves."""
+        results: Dict[str, Optional[datetime]] = {}
+        pending = []
+        
+        def resolve(github_url: str, date: Optional[datetime]):
+            results[github_url] = date
+            if on_result:
+                on_result(github_url, date)
+        
+        for github_url in dict.fromkeys(urls):
+            parsed = self._parse_github_url(github_url)
+            if not parsed:
+                print(f"Warning: Could not parse GitHub URL: {github_url}")
+                resolve(github_url, None)
+                continue
+            
+            owner, repo = parsed
+            cache_key = f"{owner}/{repo}".lower()
+            cached_data = self.cache.get_fresh(cache_key, CACHE_TTL_SECONDS)
+            if cached_data:
+                resolve(github_url, self._from_epoch(cached_data['pushed_at_epoch']))
+                continue
+            pending.append((github_url, owner, repo, cache_key))
+        
+        if not self.token:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = {
+                    executor.submit(self.get_last_commit_date, github_url): github_url
+                    for github_url, _, _, _ in pending
+                }
+                try:
+                    for future in as_completed(futures):
+                        resolve(futures[future], future.result())
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            return results
+        
+        for start in range(0, len(pending), GRAPHQL_BATCH_SIZE):
+            batch = pending[start:start + GRAPHQL_BATCH_SIZE]
+            pushed = self._fetch_graphql_batch(batch)
+            
+            fetched = []
+            dates = []
+            for i, (github_url, _, _, cache_key) in enumerate(batch):
+                if pushed is None or f'r{i}' not in pushed:
+                    dates.append((github_url, None))
+                    continue
+                pushed_at_epoch = self._to_epoch(pushed[f'r{i}'], github_url)
+                fetched.append((
+                    cache_key,
+                    {'url': github_url, 'pushed_at_epoch': pushed_at_epoch}
+                ))
+                dates.append((github_url, self._from_epoch(pushed_at_epoch)))
+            self.cache.put_many(fetched)
+            
+            for github_url, date in dates:
+                resolve(github_url, date)
+        
+        return results
+    
+    def _fetch_graphql_batch(self, batch: List[tuple]) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Query `pushedAt` for a batch of (url, owner, repo, cache_key) tuples in one request.
+        
+        Returns a mapping of alias (`r0`, `r1`, ...) to `pushedAt` for the
+        repositories that resolved, or None if the request itself failed.
+        """
+        fields = " ".join(
+            f'r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ pushedAt }}'
+            for i, (_, owner, repo, _) in enumerate(batch)
+        )
+        
+        try:
+            response = self._request(
+                'POST',
+                GITHUB_GRAPHQL_URL,
+                json={'query': f'query {{ {fields} }}'}
+            )
+            
+            # Handle rate limiting
+            if response.status_code == 403:
+                rate_limit = response.headers.get('X-RateLimit-Remaining', 'unknown')
+                print(f"Warning: GitHub API rate limit exceeded (remaining: {rate_limit})")
+                return None
+            
+            response.raise_for_status()
+            data = json_loads(response.content).get('data') or {}
+            
+            # Missing repositories come back as null alongside a NOT_FOUND error
+            pushed = {}
+            for alias, repository in data.items():
+                if repository is None:
+                    _, owner, repo, _ = batch[int(alias[1:])]
+                    print(f"Warning: Repository not found: {owner}/{repo}")
+                    continue
+                pushed[alias] = repository.get('pushedAt')
+            return pushed
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching GitHub data for {len(batch)} repositories: {e}")
+            return None
+        except (KeyError, ValueError, AttributeError) as e:
+            print(f"Error parsing GitHub data for {len(batch)} repositories: {e}")
+            return None
+    
+    def _to_epoch(self, pushed_at: Optional[str], github_url: str) -> Optional[float]:
+        """Convert a GitHub ISO-8601 timestamp to epoch seconds."""
+        if not pushed_at:
             return None
         
         try:
-            return datetime.fromisoformat(repo_info['pushed_at'].replace('Z', '+00:00'))
+            return datetime.fromisoformat(pushed_at.replace('Z', '+00:00')).timestamp()
         except (ValueError, AttributeError) as e:
             print(f"Error parsing date for {github_url}: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def _from_epoch(self, epoch: Optional[float]) -> Optional[datetime]:
+        """Convert cached epoch seconds back to an aware UTC datetime."""
+        if epoch is None:
+            return None
+        return datetime.fromtimestamp(epoch, tz=timezone.utc)
@@ -1,9 +1,12 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, NamedTuple
-from detector.config import ZOMBIE_THRESHOLD_DAYS
+from typing import Any, Callable, Dict, Iterator, List, Optional, NamedTuple, Tuple
+from detector.config import ZOMBIE_THRESHOLD_DAYS, MAX_WORKERS, CACHE_FILE
 from detector.pypi_client import PyPIClient
 from detector.github_client import GitHubClient
+from detector.session import create_session
 
 
 class HealthStatus(Enum):
@@ -30,10 +33,135 @@ class HealthChecker:
     
     def __init__(self, pypi_client: Optional[PyPIClient] = None, 
                  github_client: Optional[GitHubClient] = None,
-                 threshold_days: int = ZOMBIE_THRESHOLD_DAYS):
-        self.pypi_client = pypi_client or PyPIClient()
-        self.github_client = github_client or GitHubClient()
+                 threshold_days: int = ZOMBIE_THRESHOLD_DAYS,
+                 max_workers: int = MAX_WORKERS,
+                 no_cache: bool = False):
         self.threshold_days = threshold_days
+        self.max_workers = max(1, max_workers)
+        
+        # Without the persistent cache every lookup goes to the network; results
+        # are only kept in memory for the rest of the run
+        cache_file = None if no_cache else CACHE_FILE
+        self.pypi_client = pypi_client or PyPIClient(
+            session=create_session(pool_size=self.max_workers),
+            cache_file=cache_file
+        )
+        self.github_client = github_client or GitHubClient(
+            session=create_session(pool_size=self.max_workers),
+            cache_file=cache_file
+        )
+        
+        # Last commit date per GitHub URL for this run; many packages (plugins,
+        # split distributions) share one repository, so each is fetched once.
+        self._url_cache: Dict[str, Future] = {}
+        self._url_cache_lock = threading.Lock()
+        
+    def check_packages(self, packages: List[str], validate: bool = False,
+                       on_complete: Optional[Callable[[PackageHealth], None]] = None
+                       ) -> List[PackageHealth]:
+        """
+        Check many packages, returning results in input order.
+        
+        The scan runs as two stages so no package waits on another's round
+        trips: every PyPI lookup is fanned out over the thread pool, then all
+        discovered repositories are resolved in one batched GitHub stage.
+        `on_complete` is invoked from the calling thread as each package finishes
+        (e.g. to advance a progress bar).
+        """
+        results: List[Optional[PackageHealth]] = [None] * len(packages)
+        
+        def finish(index: int, health: PackageHealth):
+            results[index] = health
+            if on_complete:
+                on_complete(health)
+        
+        if validate:
+            for i, health in self._map_concurrently(self.validate_package, packages):
+                finish(i, health)
+            return results
+        
+        # Stage 1: resolve GitHub URLs from PyPI
+        resolved = {}
+        for i, (github_url, error_reason) in self._map_concurrently(
+                self.pypi_client.get_github_url, packages):
+            if github_url:
+                resolved[i] = github_url
+            else:
+                finish(i, self._assess(packages[i], None, None, error_reason))
+        
+        # Stage 2: fetch activity for every repository in one batch, finishing
+        # packages as their repository's date arrives
+        by_url: Dict[str, List[int]] = {}
+        for i, github_url in resolved.items():
+            by_url.setdefault(github_url, []).append(i)
+        
+        def on_commit_date(github_url: str, last_commit_date: Optional[datetime]):
+            for i in by_url[github_url]:
+                finish(i, self._assess(packages[i], github_url, last_commit_date))
+        
+        self._get_commit_dates(list(by_url), on_result=on_commit_date)
+        
+        return results
+    
+    def _get_commit_dates(self, urls: List[str],
+                          on_result: Optional[Callable[[str, Optional[datetime]], None]] = None
+                          ) -> Dict[str, Optional[datetime]]:
+        """
+        Get last commit dates for `urls`, fetching each repository at most once.
+        
+        URLs already fetched (or being fetched by another thread) are served
+        from `_url_cache`; the rest are claimed and resolved in one bulk call, so
+        concurrent lookups of the same repository coalesce into one request.
+        `on_result(url, date)` is called once per distinct URL as it resolves.
+        """
+        with self._url_cache_lock:
+            claimed = {}
+            for url in dict.fromkeys(urls):
+                if url not in self._url_cache:
+                    claimed[url] = self._url_cache[url] = Future()
+            futures = {url: self._url_cache[url] for url in urls}
+        
+        def resolve(url: str, date: Optional[datetime]):
+            claimed[url].set_result(date)
+            if on_result:
+                on_result(url, date)
+        
+        if claimed:
+            try:
+                fetched = self.github_client.get_repos_bulk(
+                    list(claimed), max_workers=self.max_workers, on_result=resolve
+                )
+            except BaseException as e:
+                with self._url_cache_lock:
+                    for url, future in claimed.items():
+                        if not future.done():
+                            del self._url_cache[url]
+                            future.set_exception(e)
+                raise
+            for url, future in claimed.items():
+                if not future.done():
+                    resolve(url, fetched.get(url))
+        
+        # Repositories claimed by another thread (or an earlier call)
+        if on_result:
+            for url in futures.keys() - claimed.keys():
+                on_result(url, futures[url].result())
+        
+        return {url: future.result() for url, future in futures.items()}
+    
+    def _map_concurrently(self, func: Callable, items: List[str]) -> Iterator[Tuple[int, Any]]:
+        """Run `func` over `items` on the worker pool, yielding (index, result) as they complete."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(func, item): i for i, item in enumerate(items)}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            except BaseException:
+                # Interrupted (Ctrl-C, a failed task or the caller giving up):
+                # drop queued work so shutdown only waits for running tasks
+                for future in futures:
+                    future.cancel()
+                raise
         
     def validate_package(self, package_name: str) -> PackageHealth:
         """
@@ -67,6 +195,17 @@ class HealthChecker:
         # Get GitHub URL from PyPI
         github_url, error_reason = self.pypi_client.get_github_url(package_name)
         
+        if not github_url:
+            return self._assess(package_name, None, None, error_reason)
+        
+        # Get last commit date from GitHub
+        last_commit_date = self._get_commit_dates([github_url])[github_url]
+        return self._assess(package_name, github_url, last_commit_date)
+    
+    def _assess(self, package_name: str, github_url: Optional[str],
+                last_commit_date: Optional[datetime],
+                error_reason: Optional[str] = None) -> PackageHealth:
+        """Classify a package from its resolved repository and last commit date."""
         if not github_url:
             return PackageHealth(
                 package_name=package_name,
@@ -77,9 +216,6 @@ class HealthChecker:
                 reason=error_reason or "No GitHub repository found"
             )
         
-        # Get last commit date from GitHub
-        last_commit_date = self.github_client.get_last_commit_date(github_url)
-        
         if not last_commit_date:
             return PackageHealth(
                 package_name=package_name,
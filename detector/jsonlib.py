@@ -0,0 +1,45 @@
+import io
+import json
+from typing import Any, BinaryIO, Union
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding/decoding
+    orjson = None
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode `obj` as UTF-8 JSON (two-space indented if `indent`), using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    # Emit UTF-8 like orjson rather than \u escapes, so output doesn't depend on the extra
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def json_dump(obj: Any, stream: BinaryIO, indent: bool = False):
+    """
+    Write `obj` to a binary stream as UTF-8 JSON, followed by a newline.
+    
+    orjson encodes the document in one piece and writes it in one call. The
+    stdlib encoder instead streams it through a buffered text wrapper, so the
+    full document text is never held in memory at once.
+    """
+    if orjson is not None:
+        stream.write(json_dumps(obj, indent) + b"\n")
+        return
+    
+    writer = io.TextIOWrapper(stream, encoding="utf-8")
+    try:
+        json.dump(obj, writer, indent=2 if indent else None, ensure_ascii=False)
+        writer.write("\n")
+        writer.flush()
+    finally:
+        # Leave `stream` open for the caller
+        writer.detach()
@@ -1,39 +1,82 @@
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 from packaging.requirements import Requirement, InvalidRequirement
+from detector.config import PARALLEL_PARSE_MIN_LINES
 
+# A bare PEP 508 project name with no specifier, extras or markers
+_NAME_RE = re.compile(r'^([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)$')
 
-def parse_requirements(filepath: Path) -> List[str]:
-    """Parse requirements.txt and extract package names"""
+
+@lru_cache(maxsize=4096)
+def _parse_name(line: str) -> str:
+    """Extract the project name from a full requirement specifier."""
+    return Requirement(line).name
+
+
+def _parse_chunk(chunk: Tuple[int, List[bytes]]) -> List[str]:
+    """
+    Extract package names from a run of raw requirement lines.
+    
+    `chunk` is (number of its first line, lines). Module-level so it can be
+    sent to worker processes.
+    """
+    first_line, lines = chunk
     packages = []
     
+    # Filter on raw bytes and only decode the lines that name a package
+    for line_num, raw in enumerate(lines, first_line):
+        # Drop comments (whole-line and inline)
+        raw = raw.split(b'#', 1)[0].strip()
+        
+        if not raw:
+            continue
+        
+        # Skip editable installs, other pip options and URLs
+        if raw.startswith((b'-', b'http://', b'https://')):
+            continue
+        
+        line = raw.decode('utf-8')
+        
+        # Plain names are common and don't need the full grammar
+        match = _NAME_RE.match(line)
+        if match:
+            packages.append(match.group(1))
+            continue
+        
+        try:
+            packages.append(_parse_name(line))
+        except InvalidRequirement as e:
+            print(f"Warning: Skipping invalid requirement on line {line_num}: {line} ({e})")
+            continue
+    
+    return packages
+
+
+def parse_requirements(filepath: Path) -> List[str]:
+    """Parse requirements.txt and extract package names"""
     if not filepath.exists():
         raise FileNotFoundError(f"Requirements file not found: {filepath}")
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            
-            if not line or line.startswith('#'):
-                continue
-            
-            if '#' in line:
-                line = line.split('#')[0].strip()
-            
-            # Skip editable installs and URLs
-            if line.startswith('-e') or line.startswith('http://') or line.startswith('https://'):
-                continue
-            
-            # Skip other pip options
-            if line.startswith('-'):
-                continue
-            
-            try:
-                req = Requirement(line)
-                packages.append(req.name)
-            except InvalidRequirement as e:
-                print(f"Warning: Skipping invalid requirement on line {line_num}: {line} ({e})")
-                continue
+    lines = filepath.read_bytes().splitlines()
+    workers = os.cpu_count() or 1
+    
+    # Huge lockfiles are split across forked processes; spawned workers (the
+    # default on macOS and Windows) re-import everything first and never pay off
+    if (len(lines) < PARALLEL_PARSE_MIN_LINES or workers == 1
+            or not sys.platform.startswith('linux')):
+        packages = _parse_chunk((1, lines))
+    else:
+        size = -(-len(lines) // workers)
+        chunks = [(start + 1, lines[start:start + size]) for start in range(0, len(lines), size)]
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            packages = [name for names in executor.map(_parse_chunk, chunks) for name in names]
     
     # Return unique packages while preserving order
-    return list(dict.fromkeys(packages))
\ No newline at end of file
+    return list(dict.fromkeys(packages))
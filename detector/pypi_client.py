@@ -1,30 +1,55 @@
 import requests
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlparse
-from detector.config import PYPI_API_URL, GITHUB_PATTERNS, PRIORITY_LABELS, IGNORE_LABELS
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from packaging.utils import canonicalize_name
+from detector.cache import CacheStore
+from detector.config import (
+    PYPI_API_URL, CACHE_FILE, CACHE_TTL_SECONDS, GITHUB_HOSTS, PRIORITY_RE, IGNORE_RE
+)
+from detector.jsonlib import json_loads
+from detector.session import create_session
+
+try:
+    import ijson
+except ImportError:  # optional: lets PyPI responses be parsed incrementally
+    ijson = None
 
 
 class PyPIClient:
-    """Client for interacting with PyPI JSON API."""
+    """Client for interacting with PyPI JSON API with caching."""
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, session: Optional[requests.Session] = None,
+                 cache_file: Optional[Path] = CACHE_FILE):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Zombie-Package-Detector/1.0'
-        })
-        
+        self.session = session or create_session()
+        self.cache = CacheStore(cache_file, 'package', ('found', 'github_url', 'reason'))
+    
+    def _store_entry(self, cache_key: str, exists: bool, github_url: Optional[str],
+                     reason: Optional[str]):
+        """Record a resolved package in the cache."""
+        self.cache.put(cache_key, found=exists, github_url=github_url, reason=reason)
         
-    def package_exists(self, package_name: str) -> tuple[bool, Optional[str]]:
+    def package_exists(self, package_name: str) -> Tuple[bool, Optional[str]]:
         """Check if a package exists on PyPI."""
+        cached_data = self.cache.get_fresh(canonicalize_name(package_name), CACHE_TTL_SECONDS)
+        if cached_data:
+            exists = bool(cached_data['found'])
+            return exists, None if exists else "Package not found on PyPI"
+        
         try:
             url = PYPI_API_URL.format(package=package_name)
-            response = self.session.get(url, timeout=self.timeout)
-            
+            # Only the status code matters; a HEAD request skips the body and
+            # leaves the connection reusable by the pool
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
             if response.status_code == 404:
+                self._store_entry(canonicalize_name(package_name), False, None,
+                                  "Package not found on PyPI")
                 return False, "Package not found on PyPI"
             
-            response.raise_for_status()
+            if response.status_code >= 400:
+                return False, f"PyPI API error: HTTP {response.status_code}"
             return True, None
             
         except requests.exceptions.Timeout:
@@ -34,53 +59,39 @@ class PyPIClient:
         except requests.exceptions.RequestException as e:
             return False, f"PyPI API error: {str(e)}"
     
-    def get_github_url(self, package_name: str) -> Optional[str]:
+    def get_github_url(self, package_name: str) -> Tuple[Optional[str], Optional[str]]:
+        
+        """
+        Resolve GitHub URL from PyPI metadata, prioritizing source code links over docs.
+        
+        Always returns (github_url, None) or (None, reason).
+        """
+        cache_key = canonicalize_name(package_name)
+        cached_data = self.cache.get_fresh(cache_key, CACHE_TTL_SECONDS)
+        if cached_data:
+            return cached_data['github_url'], cached_data['reason']
         
-        """Resolve GitHub URL from PyPI metadata, prioritizing source code links over docs"""
         try:
             url = PYPI_API_URL.format(package=package_name)
-            response = self.session.get(url, timeout=self.timeout)
-            
-            if response.status_code == 404:
-                return None, "Package not found on PyPI"
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            info = data.get('info', {})
-            
-            # Collect all potential URLs
-            github_urls = {}
-            
-            # Check project_urls
-            project_urls = info.get('project_urls') or {}
-            for label, url in project_urls.items():
-                if url and self._is_github_url(url):
-                    # Normalize label for comparison
-                    label_lower = label.lower()
-                    
-                    # Skip documentation and tracker URLs
-                    if any(ignore in label_lower for ignore in IGNORE_LABELS):
-                        continue
-                    
-                    github_urls[label] = url
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 404:
+                    self._store_entry(cache_key, False, None, "Package not found on PyPI")
+                    return None, "Package not found on PyPI"
+                
+                if response.status_code >= 400:
+                    return None, f"PyPI API error: HTTP {response.status_code}"
+                info = self._read_info(response)
             
-            # Check home_page
-            home_page = info.get('home_page')
-            if home_page and self._is_github_url(home_page):
-                github_urls['home_page'] = home_page
+            if info is None:
+                # The streamed parse failed part-way; decode the whole document
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code >= 400:
+                    return None, f"PyPI API error: HTTP {response.status_code}"
+                info = json_loads(response.content).get('info', {})
             
-            if not github_urls:
-                return None, "No GitHub repository found in PyPI metadata"
-            
-            # First, look for priority labels
-            for label, url in github_urls.items():
-                label_lower = label.lower()
-                if any(priority in label_lower for priority in PRIORITY_LABELS):
-                    return self._normalize_github_url(url), None
-            
-            # If no priority label found, return the first GitHub URL
-            return self._normalize_github_url(next(iter(github_urls.values()))), None
+            github_url, error_reason = self._select_github_url(info)
+            self._store_entry(cache_key, True, github_url, error_reason)
+            return github_url, error_reason
             
         except requests.exceptions.Timeout:
             return None, "PyPI API timeout"
@@ -91,14 +102,75 @@ class PyPIClient:
         except (KeyError, ValueError) as e:
             return None, f"Error parsing PyPI data: {str(e)}"
     
+    def _read_info(self, response: requests.Response) -> Optional[Dict[str, Any]]:
+        """
+        Read `home_page` and `project_urls` from a streamed PyPI JSON response.
+        
+        Returns None if the stream could not be parsed.
+        """
+        if ijson is None:
+            return json_loads(response.content).get('info', {})
+        
+        response.raw.decode_content = True
+        info: Dict[str, Any] = {}
+        label = None
+        try:
+            for prefix, event, value in ijson.parse(response.raw):
+                if prefix == 'info.home_page':
+                    info['home_page'] = value
+                elif prefix == 'info.project_urls':
+                    if event == 'start_map':
+                        info['project_urls'] = {}
+                    elif event == 'map_key':
+                        label = value
+                    elif event == 'end_map' and 'home_page' in info:
+                        break
+                elif prefix.startswith('info.project_urls.'):
+                    info['project_urls'][label] = value
+                elif prefix == 'info' and event == 'end_map':
+                    break
+        except (ijson.JSONError, Urllib3HTTPError):
+            return None
+        return info
+    
+    def _select_github_url(self, info: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Pick the source repository from a package's PyPI `info` block."""
+        # Collect all potential URLs
+        github_urls = {}
+        
+        # Check project_urls
+        project_urls = info.get('project_urls') or {}
+        for label, url in project_urls.items():
+            if url and self._is_github_url(url):
+                # Skip documentation and tracker URLs
+                if IGNORE_RE.search(label.lower()):
+                    continue
+                
+                github_urls[label] = url
+        
+        # Check home_page
+        home_page = info.get('home_page')
+        if home_page and self._is_github_url(home_page):
+            github_urls['home_page'] = home_page
+        
+        if not github_urls:
+            return None, "No GitHub repository found in PyPI metadata"
+        
+        # First, look for priority labels
+        for label, url in github_urls.items():
+            if PRIORITY_RE.search(label.lower()):
+                return self._normalize_github_url(url), None
+        
+        # If no priority label found, return the first GitHub URL
+        return self._normalize_github_url(next(iter(github_urls.values()))), None
+    
     def _is_github_url(self, url: str) -> bool:
         """Check if URL is a GitHub repository URL."""
         if not url:
             return False
         
         try:
-            parsed = urlparse(url.lower())
-            return any(pattern in parsed.netloc for pattern in GITHUB_PATTERNS)
+            return urlparse(url.lower()).hostname in GITHUB_HOSTS
         except Exception:
             return False
     
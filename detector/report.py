@@ -1,61 +1,151 @@
-import json
 import sys
-from typing import List
-from rich.console import Console
-from rich.table import Table, box
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+from collections import Counter
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Tuple
 from detector.health_checker import PackageHealth, HealthStatus
+from detector.jsonlib import json_dump, json_dumps
+
+# Rich is imported where it is used so JSON runs never load it
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+# Report ordering: problems first, then by package name
+_STATUS_ORDER: Dict[HealthStatus, int] = {
+    HealthStatus.WARNING: 0,
+    HealthStatus.INVALID: 1,
+    HealthStatus.SAFE: 2,
+    HealthStatus.UNKNOWN: 3,
+    HealthStatus.SKIPPED: 4
+}
+
+# Status column label and Rich style per status
+_TABLE_STATUS: Dict[HealthStatus, Tuple[str, str]] = {
+    HealthStatus.WARNING: (" WARNING", "bold red"),
+    HealthStatus.SAFE: (" Safe", "bold green"),
+    HealthStatus.INVALID: (" INVALID", "bold red"),
+    HealthStatus.SKIPPED: (" Skipped", "bold cyan"),
+    HealthStatus.UNKNOWN: (" Unknown", "bold yellow")
+}
+
+# Rendered Status cell markup, built once per status rather than per row
+_TABLE_CELL: Dict[HealthStatus, str] = {
+    status: f"[{style}]{label}[/{style}]" for status, (label, style) in _TABLE_STATUS.items()
+}
+_TABLE_CELL_DEFAULT = _TABLE_CELL[HealthStatus.UNKNOWN]
+
+_MD_STATUS: Dict[HealthStatus, str] = {status: label for status, (label, _) in _TABLE_STATUS.items()}
+
+
+def _md_cell(text: str) -> str:
+    """Keep text inside one Markdown table cell: no line breaks, literal pipes escaped."""
+    # Chained str.replace beats str.translate here: each replace is a fast
+    # substring scan, while translate pays a mapping lookup per character
+    return text.replace("\r", " ").replace("\n", " ").replace("|", "\\|")
+
 
 class Reporter:
     """Generate reports for package health checks in multiple formats."""
     
     def __init__(self, output_format: str = "table"):
-        if sys.stdout.encoding != 'utf-8':
+        # Encoding names vary in case and punctuation (UTF-8, utf_8, utf8)
+        encoding = (sys.stdout.encoding or "").lower().replace("-", "_")
+        if encoding not in ("utf_8", "utf8") and hasattr(sys.stdout, "reconfigure"):
             sys.stdout.reconfigure(encoding='utf-8')
         self.output_format = output_format.lower().strip()
         if self.output_format == "json":
-                self.console = Console(stderr=True)
+            # Diagnostics go to stderr as plain text; no Console is needed
+            self.console = None
         else:
-                self.console = Console()
+            from rich.console import Console
+            self.console = Console()
     
-    def create_progress(self) -> Progress:
-        """Create a progress bar for scanning packages."""
+    def create_progress(self) -> "Progress":
+        """
+        Create a progress bar for scanning packages.
+        
+        Rendering happens on Rich's refresh timer rather than per update, so
+        advancing the bar from the scan loop is cheap; the bar is cleared once
+        the scan finishes.
+        """
+        from rich.console import Console
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+        
         return Progress(
             SpinnerColumn(),
             TextColumn("[bold blue]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
-            console=self.console
+            console=self.console or Console(stderr=True),
+            refresh_per_second=10,
+            transient=True
         )
     
-    def print_summary(self, results: List[PackageHealth]):
+    @staticmethod
+    def _tally(results: List[PackageHealth]) -> Dict[HealthStatus, int]:
+        """Count results per status in a single pass."""
+        return Counter(r.status for r in results)
+    
+    @staticmethod
+    def _sort_results(results: List[PackageHealth]) -> List[PackageHealth]:
+        """Order results by status, then package name."""
+        # Sort plain (int, str, index) tuples so comparisons never reach the results
+        keyed = [(_STATUS_ORDER[r.status], r.package_name, i) for i, r in enumerate(results)]
+        keyed.sort()
+        return [results[i] for _, _, i in keyed]
+    
+    def report(self, results: List[PackageHealth]):
+        """
+        Print the summary and results in the configured format.
+        
+        Equivalent to print_summary() followed by print_results(), but the
+        results are tallied and sorted once and shared by both renderers.
+        """
+        tally = self._tally(results)
+        if self.output_format == "json":
+            self._print_json(results, tally)
+            return
+        
+        sorted_results = self._sort_results(results)
+        if self.output_format == "markdown":
+            self._print_markdown(sorted_results, tally)
+        else:
+            self._print_summary(len(results), tally)
+            self._print_table(sorted_results)
+    
+    def print_summary(self, results: List[PackageHealth],
+                      tally: Optional[Dict[HealthStatus, int]] = None):
         """Print summary statistics."""
         if self.output_format in ["json", "markdown"]:
             return  
         
-        total = len(results)
-        safe = sum(1 for r in results if r.status == HealthStatus.SAFE)
-        warning = sum(1 for r in results if r.status == HealthStatus.WARNING)
-        unknown = sum(1 for r in results if r.status == HealthStatus.UNKNOWN)
-        skipped = sum(1 for r in results if r.status == HealthStatus.SKIPPED)
-        invalid = sum(1 for r in results if r.status == HealthStatus.INVALID)
+        self._print_summary(len(results), tally or self._tally(results))
+    
+    def _print_summary(self, total: int, tally: Dict[HealthStatus, int]):
+        if total == 0:
+            return
         
-        summary_text = f"[bold]Scanned:[/bold] {total} packages\n"
+        from rich.panel import Panel
+        
+        safe = tally.get(HealthStatus.SAFE, 0)
+        warning = tally.get(HealthStatus.WARNING, 0)
+        unknown = tally.get(HealthStatus.UNKNOWN, 0)
+        skipped = tally.get(HealthStatus.SKIPPED, 0)
+        invalid = tally.get(HealthStatus.INVALID, 0)
+        
+        parts = [f"[bold]Scanned:[/bold] {total} packages"]
         
         if safe > 0:
-            summary_text += f"[bold green] Safe:[/bold green] {safe}\n"
+            parts.append(f"[bold green] Safe:[/bold green] {safe}")
         if warning > 0:
-            summary_text += f"[bold red] Warning:[/bold red] {warning}\n"
+            parts.append(f"[bold red] Warning:[/bold red] {warning}")
         if unknown > 0:
-            summary_text += f"[bold yellow] Unknown:[/bold yellow] {unknown}\n"
+            parts.append(f"[bold yellow] Unknown:[/bold yellow] {unknown}")
         if skipped > 0:
-            summary_text += f"[bold cyan] Skipped:[/bold cyan] {skipped}\n"
+            parts.append(f"[bold cyan] Skipped:[/bold cyan] {skipped}")
         if invalid > 0:
-            summary_text += f"[bold red] Invalid:[/bold red] {invalid}"
+            parts.append(f"[bold red] Invalid:[/bold red] {invalid}")
         
         panel = Panel(
-            summary_text.rstrip(),
+            "\n".join(parts),
             title="[bold]Scan Summary[/bold]",
             border_style="blue",
             expand=False
@@ -64,16 +154,19 @@ class Reporter:
         self.console.print()
         self.console.print(panel)
     
-    def print_results(self, results: List[PackageHealth]):
+    def print_results(self, results: List[PackageHealth],
+                      tally: Optional[Dict[HealthStatus, int]] = None):
         """Print results in the configured format."""
         if self.output_format == "json":
-            self._print_json(results)
+            self._print_json(results, tally or self._tally(results))
         elif self.output_format == "markdown":
-            self._print_markdown(results)
+            self._print_markdown(self._sort_results(results), tally or self._tally(results))
         else:
-            self._print_table(results)
+            self._print_table(self._sort_results(results))
     
-    def _print_table(self, results: List[PackageHealth]):
+    def _print_table(self, sorted_results: List[PackageHealth]):
+        from rich.table import Table, box
+        
         table = Table(
             title="Package Health Report",
             show_header=True,
@@ -87,44 +180,19 @@ class Reporter:
         table.add_column("GitHub URL", style="dim", overflow="fold")
         table.add_column("Details", overflow="fold")
         
-        status_order = {
-            HealthStatus.WARNING: 0,
-            HealthStatus.INVALID: 1,
-            HealthStatus.SAFE: 2,
-            HealthStatus.UNKNOWN: 3,
-            HealthStatus.SKIPPED: 4
-        }
-        sorted_results = sorted(results, key=lambda r: (status_order[r.status], r.package_name))
-        
         for result in sorted_results:
-            if result.status == HealthStatus.WARNING:
-                status_str = " WARNING"
-                status_style = "bold red"
-            elif result.status == HealthStatus.SAFE:
-                status_str = " Safe"
-                status_style = "bold green"
-            elif result.status == HealthStatus.INVALID:
-                status_str = " INVALID"
-                status_style = "bold red"
-            elif result.status == HealthStatus.SKIPPED:
-                status_str = " Skipped"
-                status_style = "bold cyan"
-            else:
-                status_str = " Unknown"
-                status_style = "bold yellow"
-            
             # Days since commit
-            days_str = str(result.days_since_commit) if result.days_since_commit is not None else "-"
+            days_str = "-" if result.days_since_commit is None else f"{result.days_since_commit}"
             
             # GitHub URL
-            github_str = result.github_url if result.github_url else "N/A"
+            github_str = result.github_url or "N/A"
             
             # Details/Reason
             details = result.reason or "No information"
             
             table.add_row(
                 result.package_name,
-                f"[{status_style}]{status_str}[/{status_style}]",
+                _TABLE_CELL.get(result.status, _TABLE_CELL_DEFAULT),
                 days_str,
                 github_str,
                 details
@@ -133,23 +201,21 @@ class Reporter:
         self.console.print()
         self.console.print(table)
     
-    def _print_json(self, results: List[PackageHealth]):
+    def _print_json(self, results: List[PackageHealth], tally: Dict[HealthStatus, int]):
         """Print results as JSON to stdout (CI-safe)."""
         output = {
             "version": "1.1.0",
             "total": len(results),
             "summary": {
-                "safe": sum(1 for r in results if r.status == HealthStatus.SAFE),
-                "warning": sum(1 for r in results if r.status == HealthStatus.WARNING),
-                "unknown": sum(1 for r in results if r.status == HealthStatus.UNKNOWN),
-                "skipped": sum(1 for r in results if r.status == HealthStatus.SKIPPED),
-                "invalid": sum(1 for r in results if r.status == HealthStatus.INVALID)
-            },
-            "packages": []
+                "safe": tally.get(HealthStatus.SAFE, 0),
+                "warning": tally.get(HealthStatus.WARNING, 0),
+                "unknown": tally.get(HealthStatus.UNKNOWN, 0),
+                "skipped": tally.get(HealthStatus.SKIPPED, 0),
+                "invalid": tally.get(HealthStatus.INVALID, 0)
+            }
         }
-        
-        for result in results:
-            package_data = {
+        output["packages"] = [
+            {
                 "name": result.package_name,
                 "status": result.status.value,
                 "github_url": result.github_url,
@@ -157,29 +223,38 @@ class Reporter:
                 "last_commit_date": result.last_commit_date.isoformat() if result.last_commit_date else None,
                 "reason": result.reason
             }
-            output["packages"].append(package_data)
+            for result in results
+        ]
         
-        sys.stdout.write(json.dumps(output, indent=2))
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        buffer = self._stdout_buffer()
+        if buffer is None:
+            self._write_stdout(json_dumps(output, indent=True) + b"\n")
+            return
+        
+        json_dump(output, buffer, indent=True)
+        buffer.flush()
     
-    def _print_markdown(self, results: List[PackageHealth]):
+    def _print_markdown(self, sorted_results: List[PackageHealth], tally: Dict[HealthStatus, int]):
         """Print results as GitHub-Flavored Markdown to stdout."""
-        lines = []
-        lines.append("# Package Health Report")
-        lines.append("")
+        if not sorted_results:
+            self._write_stdout(b"# Package Health Report\n\nNo packages scanned.\n")
+            return
         
         # Summary
-        total = len(results)
-        safe = sum(1 for r in results if r.status == HealthStatus.SAFE)
-        warning = sum(1 for r in results if r.status == HealthStatus.WARNING)
-        unknown = sum(1 for r in results if r.status == HealthStatus.UNKNOWN)
-        skipped = sum(1 for r in results if r.status == HealthStatus.SKIPPED)
-        invalid = sum(1 for r in results if r.status == HealthStatus.INVALID)
-        
-        lines.append("## Summary")
-        lines.append("")
-        lines.append(f"- **Total Packages**: {total}")
+        total = len(sorted_results)
+        safe = tally.get(HealthStatus.SAFE, 0)
+        warning = tally.get(HealthStatus.WARNING, 0)
+        unknown = tally.get(HealthStatus.UNKNOWN, 0)
+        skipped = tally.get(HealthStatus.SKIPPED, 0)
+        invalid = tally.get(HealthStatus.INVALID, 0)
+        
+        lines = [
+            "# Package Health Report",
+            "",
+            "## Summary",
+            "",
+            f"- **Total Packages**: {total}"
+        ]
         if safe > 0:
             lines.append(f"-  **Safe**: {safe}")
         if warning > 0:
@@ -191,46 +266,65 @@ class Reporter:
         if invalid > 0:
             lines.append(f"-  **Invalid**: {invalid}")
         
+        lines.extend([
+            "",
+            "## Packages",
+            "",
+            "| Package | Status | Days Since Commit | GitHub URL | Details |",
+            "|---------|--------|-------------------|------------|---------|"
+        ])
+        lines.extend([self._markdown_row(result) for result in sorted_results])
         lines.append("")
-        lines.append("## Packages")
-        lines.append("")
-        lines.append("| Package | Status | Days Since Commit | GitHub URL | Details |")
-        lines.append("|---------|--------|-------------------|------------|---------|")
-        
-        status_order = {
-            HealthStatus.WARNING: 0,
-            HealthStatus.INVALID: 1,
-            HealthStatus.SAFE: 2,
-            HealthStatus.UNKNOWN: 3,
-            HealthStatus.SKIPPED: 4
-        }
-        sorted_results = sorted(results, key=lambda r: (status_order[r.status], r.package_name))
         
-        for result in sorted_results:
-            if result.status == HealthStatus.WARNING:
-                status_str = " WARNING"
-            elif result.status == HealthStatus.SAFE:
-                status_str = " Safe"
-            elif result.status == HealthStatus.INVALID:
-                status_str = " INVALID"
-            elif result.status == HealthStatus.SKIPPED:
-                status_str = " Skipped"
-            else:
-                status_str = " Unknown"
-            
-            days_str = str(result.days_since_commit) if result.days_since_commit is not None else "-"
-            github_str = result.github_url if result.github_url else "N/A"
-            details =(result.reason or "No information").replace("\n", " ")
-            
-            lines.append(f"| {result.package_name} | {status_str} | {days_str} | {github_str} | {details} |")
+        self._write_stdout("\n".join(lines).encode("utf-8"))
+    
+    @staticmethod
+    def _markdown_row(result: PackageHealth) -> str:
+        """Format one result as a Markdown table row."""
+        status_str = _MD_STATUS.get(result.status, " Unknown")
         
-        print("\n".join(lines), file=sys.stdout)
+        days_str = "-" if result.days_since_commit is None else f"{result.days_since_commit}"
+        github_str = _md_cell(result.github_url or "N/A")
+        details = _md_cell(result.reason or "No information")
+        
+        return f"| {result.package_name} | {status_str} | {days_str} | {github_str} | {details} |"
+    
+    @staticmethod
+    def _stdout_buffer() -> Optional[BinaryIO]:
+        """Return stdout's binary buffer (None if it has none), flushing pending text first."""
+        sys.stdout.flush()
+        return getattr(sys.stdout, "buffer", None)
+    
+    @staticmethod
+    def _write_stdout(payload: bytes):
+        """
+        Write an encoded document to stdout in one call.
+        
+        Going straight to the binary buffer skips the text layer's encoding and
+        line buffering, so the whole report is flushed as a single write.
+        """
+        # Keep reports to one write each; only the stdlib JSON fallback
+        # (json_dump() without orjson) streams in chunks.
+        buffer = Reporter._stdout_buffer()
+        if buffer is None:
+            sys.stdout.write(payload.decode("utf-8"))
+            sys.stdout.flush()
+            return
+        
+        buffer.write(payload)
+        buffer.flush()
+    
+    def _print_message(self, label: str, style: str, message: str):
+        if self.console is None:
+            print(f"{label}: {message}", file=sys.stderr)
+        else:
+            self.console.print(f"[{style}]{label}:[/{style}] {message}")
     
     def print_error(self, message: str):
-        self.console.print(f"[bold red]Error:[/bold red] {message}")
+        self._print_message("Error", "bold red", message)
     
     def print_warning(self, message: str):
-        self.console.print(f"[bold yellow]Warning:[/bold yellow] {message}")
+        self._print_message("Warning", "bold yellow", message)
     
     def print_info(self, message: str):
-        self.console.print(f"[bold blue]Info:[/bold blue] {message}")
\ No newline at end of file
+        self._print_message("Info", "bold blue", message)
\ No newline at end of file
@@ -0,0 +1,29 @@
+import requests
+from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from detector.config import MAX_WORKERS, HTTP_RETRIES, USER_AGENT
+
+
+def create_session(pool_size: int = MAX_WORKERS,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Create a requests Session with a `pool_size` connection pool and retries on transient failures."""
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    if headers:
+        session.headers.update(headers)
+    
+    # Read timeouts are not retried: a hung host would otherwise cost
+    # (HTTP_RETRIES + 1) full timeouts per lookup
+    retry = Retry(
+        total=HTTP_RETRIES,
+        read=False,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({'HEAD', 'GET', 'POST'}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session